@@ -1,35 +1,132 @@
 # This file is used to calculate the aircraft geometry based on the input parameters
+import functools
+import math
+import os
+import sys
+from typing import NamedTuple
 import numpy as np
-import json
 np.set_printoptions(precision=8)
 
+# orjson is optional; the stdlib json is used when it is not installed
+try:
+    import orjson as _json
+except ImportError:
+    import json as _json
+
+# inch-valued inputs, in the order _parse_input gathers them and load_json unpacks them
+LIFTING_SURFACE_INCH_KEYS = (
+    "length_from_nose_to_leading_edge_at_root[in]",
+    "length_parallel_to_unswept_segment[in]",
+    "length_perpendicular_to_unswept_segment[in]",
+    "root_chord[in]",
+    "tip_chord[in]",
+    "semispan[in]",
+    "thickness[in]",
+)
+CONTROL_SURFACE_INCH_KEYS = (
+    "spanwise_distance_from_root[in]",
+    "chord[in]",
+    "thickness[in]",
+)
+
+
+class _InputValues(NamedTuple):
+    """The parsed contents of an input json, with every [in] value converted to feet"""
+    lifting_surface_name: str
+    swept: bool
+    control_surface_name: str
+    has_control_surface: bool
+    feet: tuple  # LIFTING_SURFACE_INCH_KEYS then the [root, tip] pairs of CONTROL_SURFACE_INCH_KEYS
+
+
+@functools.lru_cache(maxsize=128)
+def _parse_input(input_file, mtime):
+    """
+    Parses an input json. Results are cached, and mtime is part of the key so that edits to the file are picked up.
+
+    Args:
+        input_file (str): The absolute path to the input json.
+        mtime (float): The modification time of the input json.
+
+    Returns:
+        _InputValues: The parsed input values.
+    """
+    with open(input_file, 'rb') as json_handle:
+        input_vals = _json.loads(json_handle.read())
+
+    lifting_surface = input_vals["lifting_surface"]
+    control_surface = input_vals["control_surface"]
+
+    # gather every [in] value in a fixed order and convert them to feet in one pass; only the [root, tip]
+    # entries of the control surface lists are read so that the offsets unpacked by load_json stay fixed
+    raw = np.fromiter(
+        [lifting_surface[key] for key in LIFTING_SURFACE_INCH_KEYS]
+        + [control_surface[key][index] for key in CONTROL_SURFACE_INCH_KEYS for index in (0, 1)],
+        dtype=np.float64,
+    )
+    # unpacked as plain floats, which are cheaper than numpy scalars for the scalar math that follows
+    feet = tuple(inches_to_feet(raw).tolist())
+
+    return _InputValues(
+        lifting_surface_name=lifting_surface["name[str]"],
+        swept=lifting_surface["swept[bool]"],
+        control_surface_name=control_surface["name[str]"],
+        has_control_surface=control_surface["has_control_surface[bool]"],
+        feet=feet,
+    )
+
+
+def _read_input(input_file):
+    """
+    Returns the parsed values of an input json, reusing the cached result if the file has not changed.
+
+    Args:
+        input_file (str): The path to the input json.
+
+    Returns:
+        _InputValues: The parsed input values.
+    """
+    input_file = os.path.abspath(input_file)
+    return _parse_input(input_file, os.path.getmtime(input_file))
+
 
 class aircraft_geometry:
     """This class is used to calculate the aircraft geometry based on the input parameters"""
-    def __init__(self, input_data):
+    def __init__(self, input_data, verbose=True):
         self.input_data = input_data
+        self.verbose = verbose
         self.load_json()
-        print("")
-        print("Lifting Surface Name:", self.lifting_surface_name)
+        self.write(f"\nLifting Surface Name: {self.lifting_surface_name}\n")
         if self.swept:
             self.calculate_geometry()
-            if self.has_control_surface:
-                self.control_surface_geometry()
-            else:
-                print("")
         else:
             self.unswept_geometry()
-            if self.has_control_surface:
-                self.control_surface_geometry()
-            else:
-                print("")
-        print("")
+        if self.has_control_surface:
+            self.control_surface_geometry()
+            self.write("\n")
+        else:
+            self.write("\n\n")
+
+    def write(self, report):
+        """
+        Writes a block of report text to stdout in a single call, unless verbose is False.
+
+        Args:
+            report (str): The text to write.
+
+        Returns:
+            None
+        """
+        if self.verbose:
+            sys.stdout.write(report)
 
     def load_json(self):
         """
         This function pulls in all the input values from the json.
 
         It reads the input values from a JSON file and assigns them to the corresponding class attributes.
+        The control surface [root, tip] pairs are tuples of plain floats shared with the cached input values, so
+        no reference to the parsed JSON lists is kept and the pairs cannot be modified in place.
 
         Args:
             None
@@ -37,33 +134,27 @@ class aircraft_geometry:
         Returns:
             None
         """    
-        with open(self.input_data, 'r') as json_handle:
-            input_vals = json.load(json_handle)
-
-            # lifting surface json values
-            self.lifting_surface_name = input_vals["lifting_surface"]["name[str]"]
-            self.length_from_nose_to_leading_edge_at_root = inches_to_feet(input_vals["lifting_surface"]["length_from_nose_to_leading_edge_at_root[in]"])
-            self.parallel_length = inches_to_feet(input_vals["lifting_surface"]["length_parallel_to_unswept_segment[in]"])
-            self.perpendicular_length = inches_to_feet(input_vals["lifting_surface"]["length_perpendicular_to_unswept_segment[in]"])
-            self.root_chord = inches_to_feet(input_vals["lifting_surface"]["root_chord[in]"])
-            self.tip_chord = inches_to_feet(input_vals["lifting_surface"]["tip_chord[in]"])
-            self.semispan = inches_to_feet(input_vals["lifting_surface"]["semispan[in]"])
-            self.b = 2 * self.semispan
-            self.thickness = inches_to_feet(input_vals["lifting_surface"]["thickness[in]"])
-            self.swept = input_vals["lifting_surface"]["swept[bool]"]
-
-            # control surface json values
-            self.control_surface_name = input_vals["control_surface"]["name[str]"]
-            self.has_control_surface = input_vals["control_surface"]["has_control_surface[bool]"]
-            self.spanwise_distances_from_root = input_vals["control_surface"]["spanwise_distance_from_root[in]"]
-            self.spanwise_distances_from_root[0] = inches_to_feet(self.spanwise_distances_from_root[0])
-            self.spanwise_distances_from_root[1] = inches_to_feet(self.spanwise_distances_from_root[1])
-            self.control_surface_chords = input_vals["control_surface"]["chord[in]"]
-            self.control_surface_chords[0] = inches_to_feet(self.control_surface_chords[0])
-            self.control_surface_chords[1] = inches_to_feet(self.control_surface_chords[1])
-            self.control_surface_thickness = input_vals["control_surface"]["thickness[in]"]
-            self.control_surface_thickness[0] = inches_to_feet(self.control_surface_thickness[0])
-            self.control_surface_thickness[1] = inches_to_feet(self.control_surface_thickness[1])
+        input_vals = _read_input(self.input_data)
+        feet = input_vals.feet
+
+        # lifting surface json values
+        self.lifting_surface_name = input_vals.lifting_surface_name
+        (self.length_from_nose_to_leading_edge_at_root,
+         self.parallel_length,
+         self.perpendicular_length,
+         self.root_chord,
+         self.tip_chord,
+         self.semispan,
+         self.thickness) = feet[:7]
+        self.b = 2 * self.semispan
+        self.swept = input_vals.swept
+
+        # control surface json values, stored as (root, tip) tuples
+        self.control_surface_name = input_vals.control_surface_name
+        self.has_control_surface = input_vals.has_control_surface
+        self.spanwise_distances_from_root = feet[7:9]
+        self.control_surface_chords = feet[9:11]
+        self.control_surface_thickness = feet[11:13]
 
     def calculate_x_offset_from_nose(self):
         """
@@ -90,7 +181,7 @@ class aircraft_geometry:
             None
 
         """
-        self.le_sweep_angle = np.arctan2(self.perpendicular_length, self.parallel_length) # in radians
+        self.le_sweep_angle = math.atan2(self.perpendicular_length, self.parallel_length) # in radians
         
     def calculate_taper_ratio(self):
         """
@@ -116,7 +207,12 @@ class aircraft_geometry:
             None
 
         """
-        self.quarter_chord_sweep_angle = np.arctan(np.tan(self.le_sweep_angle)+2*(0.25/self.b)*self.root_chord*(self.taper_ratio-1))
+        # tan(le_sweep_angle) is perpendicular_length/parallel_length, so no trig is needed for it unless parallel_length is 0
+        if self.parallel_length == 0:
+            tan_le_sweep_angle = math.tan(self.le_sweep_angle)
+        else:
+            tan_le_sweep_angle = self.perpendicular_length / self.parallel_length
+        self.quarter_chord_sweep_angle = math.atan(tan_le_sweep_angle+2*(0.25/self.b)*self.root_chord*(self.taper_ratio-1))
 
     def calculate_thicknesses(self):
         """
@@ -186,17 +282,19 @@ class aircraft_geometry:
         self.calculate_x_offset_from_nose()
         self.calculate_quarter_chord_sweep_angle()
 
-        print("Swept Geometric Parameters")
-        print("x offset from nose[ft]: ", self.x_offset_from_nose)
-        print("Chord at root[ft]: ", self.root_chord)
-        print("Chord at tip[ft]: ", self.tip_chord)
-        print("Leading edge sweep angle[deg]: ", np.degrees(self.le_sweep_angle))
-        print("Taper ratio: ", self.taper_ratio)
-        print("Quarter chord sweep angle[deg]: ", np.degrees(self.quarter_chord_sweep_angle))
-        print("Thickness divided by root chord: ", self.thickness_root)
-        print("Thickness divided by tip chord: ", self.thickness_tip)
-        print("semispan[ft]: ", self.semispan)
-        print("\n")
+        self.write(
+            "Swept Geometric Parameters\n"
+            f"x offset from nose[ft]:  {self.x_offset_from_nose}\n"
+            f"Chord at root[ft]:  {self.root_chord}\n"
+            f"Chord at tip[ft]:  {self.tip_chord}\n"
+            f"Leading edge sweep angle[deg]:  {math.degrees(self.le_sweep_angle)}\n"
+            f"Taper ratio:  {self.taper_ratio}\n"
+            f"Quarter chord sweep angle[deg]:  {math.degrees(self.quarter_chord_sweep_angle)}\n"
+            f"Thickness divided by root chord:  {self.thickness_root}\n"
+            f"Thickness divided by tip chord:  {self.thickness_tip}\n"
+            f"semispan[ft]:  {self.semispan}\n"
+            "\n\n"
+        )
 
     def unswept_geometry(self):
         """
@@ -214,15 +312,17 @@ class aircraft_geometry:
         self.calculate_taper_ratio()
         self.calculate_thicknesses()
         self.calculate_x_offset_from_nose()
-        print("Unswept Geometric Parameters")
-        print("x offset from nose[ft]: ", self.x_offset_from_nose)
-        print("Chord at root[ft]: ", self.root_chord)
-        print("Chord at tip[ft]: ", self.tip_chord)
-        print("Taper ratio: ", self.taper_ratio)
-        print("Thickness divided by root chord: ", self.thickness_root)
-        print("Thickness divided by tip chord: ", self.thickness_tip)
-        print("semispan[ft]: ", self.semispan)
-        print("\n")
+        self.write(
+            "Unswept Geometric Parameters\n"
+            f"x offset from nose[ft]:  {self.x_offset_from_nose}\n"
+            f"Chord at root[ft]:  {self.root_chord}\n"
+            f"Chord at tip[ft]:  {self.tip_chord}\n"
+            f"Taper ratio:  {self.taper_ratio}\n"
+            f"Thickness divided by root chord:  {self.thickness_root}\n"
+            f"Thickness divided by tip chord:  {self.thickness_tip}\n"
+            f"semispan[ft]:  {self.semispan}\n"
+            "\n\n"
+        )
 
     def control_surface_geometry(self):
         """
@@ -237,26 +337,185 @@ class aircraft_geometry:
         Returns:
             None
         """
-        print("Control Surface Name:", self.control_surface_name)
         self.calculate_control_surface_spanwise_locations()
         self.calculate_control_surface_chord_fraction()
-        print("Control Surface Chord Fraction Root: ", self.control_surface_chord_fraction_root)
-        print("Control Surface Chord Fraction Tip: ", self.control_surface_chord_fraction_tip)
-        print("Control Surface Taper Ratio: ", self.control_surface_taper_ratio)
-        print("Control Surface Thickness divided by Root Chord: ", self.thickness_control_surface_root)
-        print("Control Surface Thickness divided by Tip Chord: ", self.thickness_control_surface_tip)
-        print("Control Surface Spanwise Location Root: ", self.control_surface_spanwise_location_root)
-        print("Control Surface Spanwise Location Tip: ", self.control_surface_spanwise_location_tip)
+        self.write(
+            f"Control Surface Name: {self.control_surface_name}\n"
+            f"Control Surface Chord Fraction Root:  {self.control_surface_chord_fraction_root}\n"
+            f"Control Surface Chord Fraction Tip:  {self.control_surface_chord_fraction_tip}\n"
+            f"Control Surface Taper Ratio:  {self.control_surface_taper_ratio}\n"
+            f"Control Surface Thickness divided by Root Chord:  {self.thickness_control_surface_root}\n"
+            f"Control Surface Thickness divided by Tip Chord:  {self.thickness_control_surface_tip}\n"
+            f"Control Surface Spanwise Location Root:  {self.control_surface_spanwise_location_root}\n"
+            f"Control Surface Spanwise Location Tip:  {self.control_surface_spanwise_location_tip}\n"
+        )
+
+
+class aircraft_geometry_batch:
+    """This class is used to calculate the geometry of many aircraft at once, one array entry per input file"""
+    def __init__(self, input_data, verbose=True):
+        if isinstance(input_data, (str, bytes, os.PathLike)):
+            raise TypeError("aircraft_geometry_batch expects a list of input json paths, not a single path")
+        self.input_data = list(input_data)
+        self.verbose = verbose
+        self.load_json()
+        self.calculate_geometry()
+        self.report()
+
+    def write(self, report):
+        """
+        Writes a block of report text to stdout in a single call, unless verbose is False.
+
+        Args:
+            report (str): The text to write.
+
+        Returns:
+            None
+        """
+        if self.verbose:
+            sys.stdout.write(report)
+
+    def load_json(self):
+        """
+        This function pulls in the input values from every json in the batch.
+
+        Each [in] field is stored as its own array of shape (N,) in feet, where N is the number of input files.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        Raises:
+            ValueError: If no input files were given.
+        """
+        if not self.input_data:
+            raise ValueError("aircraft_geometry_batch needs at least one input json")
+        inputs = [_read_input(input_file) for input_file in self.input_data]
+
+        # one row per field so that each attribute is a contiguous (N,) array
+        feet = np.stack([input_vals.feet for input_vals in inputs], axis=1)
+
+        # lifting surface json values
+        self.lifting_surface_name = [input_vals.lifting_surface_name for input_vals in inputs]
+        (self.length_from_nose_to_leading_edge_at_root,
+         self.parallel_length,
+         self.perpendicular_length,
+         self.root_chord,
+         self.tip_chord,
+         self.semispan,
+         self.thickness) = feet[:7]
+        self.b = 2 * self.semispan
+        self.swept = np.asarray([input_vals.swept for input_vals in inputs], dtype=bool)
+
+        # control surface json values, each of shape (2, N) holding the [root, tip] values
+        self.control_surface_name = [input_vals.control_surface_name for input_vals in inputs]
+        self.has_control_surface = np.asarray([input_vals.has_control_surface for input_vals in inputs], dtype=bool)
+        self.spanwise_distances_from_root = feet[7:9]
+        self.control_surface_chords = feet[9:11]
+        self.control_surface_thickness = feet[11:13]
+
+    def calculate_geometry(self):
+        """
+        Calculates the geometry of every aircraft in the batch.
+
+        The expressions match those of aircraft_geometry but operate on whole arrays. Values that do not apply to
+        an entry (sweep angles of unswept surfaces, ratios over a zero chord or semispan, control surface values
+        when there is no control surface) are set to NaN rather than raising or reporting "N/A".
+
+        Returns:
+            None
+        """
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self.x_offset_from_nose = -self.length_from_nose_to_leading_edge_at_root - (self.root_chord*0.25)
+            self.taper_ratio = _ratio(self.tip_chord, self.root_chord)
+            self.thickness_root = _ratio(self.thickness, self.root_chord)
+            self.thickness_tip = _ratio(self.thickness, self.tip_chord)
+
+            le_sweep_angle = np.arctan2(self.perpendicular_length, self.parallel_length) # in radians
+            tan_le_sweep_angle = np.where(self.parallel_length == 0, np.tan(le_sweep_angle), self.perpendicular_length / self.parallel_length)
+            quarter_chord_sweep_angle = np.arctan(tan_le_sweep_angle+2*(0.25/self.b)*self.root_chord*(self.taper_ratio-1))
+            self.le_sweep_angle = np.where(self.swept, le_sweep_angle, np.nan)
+            self.quarter_chord_sweep_angle = np.where(self.swept, quarter_chord_sweep_angle, np.nan)
+
+            has_control_surface = self.has_control_surface
+            chords = self.control_surface_chords
+            self.control_surface_taper_ratio = np.where(has_control_surface, _ratio(chords[1], chords[0]), np.nan)
+            self.thickness_control_surface_root, self.thickness_control_surface_tip = np.where(
+                has_control_surface, _ratio(self.control_surface_thickness, chords), np.nan)
+            self.control_surface_chord_fraction_root, self.control_surface_chord_fraction_tip = np.where(
+                has_control_surface, _ratio(chords, np.stack((self.root_chord, self.tip_chord))), np.nan)
+            self.control_surface_spanwise_location_root, self.control_surface_spanwise_location_tip = np.where(
+                has_control_surface, _ratio(self.spanwise_distances_from_root, self.semispan), np.nan)
+
+    def report(self):
+        """
+        Collects the batch results into a structured array and prints it, unless verbose is False.
+
+        The structured array is kept as self.results so that individual columns can be pulled out by name. It is
+        printed as a table with one row per parameter and one column per input file.
+
+        Returns:
+            None
+        """
+        columns = {
+            "x offset from nose[ft]": self.x_offset_from_nose,
+            "Chord at root[ft]": self.root_chord,
+            "Chord at tip[ft]": self.tip_chord,
+            "Leading edge sweep angle[deg]": np.degrees(self.le_sweep_angle),
+            "Taper ratio": self.taper_ratio,
+            "Quarter chord sweep angle[deg]": np.degrees(self.quarter_chord_sweep_angle),
+            "Thickness divided by root chord": self.thickness_root,
+            "Thickness divided by tip chord": self.thickness_tip,
+            "semispan[ft]": self.semispan,
+            "Control Surface Chord Fraction Root": self.control_surface_chord_fraction_root,
+            "Control Surface Chord Fraction Tip": self.control_surface_chord_fraction_tip,
+            "Control Surface Taper Ratio": self.control_surface_taper_ratio,
+            "Control Surface Thickness divided by Root Chord": self.thickness_control_surface_root,
+            "Control Surface Thickness divided by Tip Chord": self.thickness_control_surface_tip,
+            "Control Surface Spanwise Location Root": self.control_surface_spanwise_location_root,
+            "Control Surface Spanwise Location Tip": self.control_surface_spanwise_location_tip,
+        }
+        self.results = np.empty(len(self.input_data), dtype=[("Lifting Surface Name", object)] + [(name, np.float64) for name in columns])
+        self.results["Lifting Surface Name"] = self.lifting_surface_name
+        for name, values in columns.items():
+            self.results[name] = values
+
+        label_width = max(len(name) for name in self.results.dtype.names) + 2
+        column_width = max([16] + [len(name) + 2 for name in self.lifting_surface_name])
+        lines = ["", "Batch Geometric Parameters"]
+        for name in self.results.dtype.names:
+            if name == "Lifting Surface Name":
+                cells = "".join(f"{value:>{column_width}}" for value in self.results[name])
+            else:
+                cells = "".join(f"{value:>{column_width}.8g}" for value in self.results[name])
+            lines.append(f"{name + ':':<{label_width}}{cells}")
+        self.write("\n".join(lines) + "\n\n")
+
+def _ratio(numerator, denominator):
+    """
+    Divides two arrays element by element, giving NaN wherever the denominator is zero.
+
+    Args:
+        numerator (np.ndarray): The numerator.
+        denominator (np.ndarray): The denominator, broadcastable against the numerator.
+
+    Returns:
+        np.ndarray: The ratio.
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(denominator == 0, np.nan, numerator / denominator)
 
 def inches_to_feet(inches):
     """
     This function converts inches to feet.
 
     Args:
-        inches (float): The length in inches to be converted to feet.
+        inches (float or np.ndarray): The length(s) in inches to be converted to feet.
 
     Returns:
-        float: The length in feet.
+        float or np.ndarray: The length(s) in feet.
     """
     return inches / 12.0
 
@@ -0,0 +1,228 @@
+# Tests for calculate_aircraft_geometry.py
+import json
+import math
+import os
+
+import numpy as np
+import pytest
+
+from calculate_aircraft_geometry import _parse_input, aircraft_geometry, aircraft_geometry_batch
+
+EXAMPLE_INPUT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "calculate_aircraft_geometry.json")
+
+# attributes set by aircraft_geometry for every input with a control surface
+COMMON_ATTRIBUTES = (
+    "x_offset_from_nose",
+    "taper_ratio",
+    "thickness_root",
+    "thickness_tip",
+    "control_surface_taper_ratio",
+    "thickness_control_surface_root",
+    "thickness_control_surface_tip",
+    "control_surface_chord_fraction_root",
+    "control_surface_chord_fraction_tip",
+    "control_surface_spanwise_location_root",
+    "control_surface_spanwise_location_tip",
+)
+SWEPT_ATTRIBUTES = ("le_sweep_angle", "quarter_chord_sweep_angle")
+
+
+# reports printed by the original implementation for the example input and its variants
+SWEPT_REPORT = (
+    "Swept Geometric Parameters\n"
+    "x offset from nose[ft]:  -2.525390625\n"
+    "Chord at root[ft]:  0.6015625\n"
+    "Chord at tip[ft]:  0.328125\n"
+    "Leading edge sweep angle[deg]:  31.607502246248906\n"
+    "Taper ratio:  0.5454545454545454\n"
+    "Quarter chord sweep angle[deg]:  25.227649467428588\n"
+    "Thickness divided by root chord:  0.017316017316017316\n"
+    "Thickness divided by tip chord:  0.031746031746031744\n"
+    "semispan[ft]:  0.4739583333333333\n"
+    "\n\n"
+)
+UNSWEPT_REPORT = (
+    "Unswept Geometric Parameters\n"
+    "x offset from nose[ft]:  -2.525390625\n"
+    "Chord at root[ft]:  0.6015625\n"
+    "Chord at tip[ft]:  0.16666666666666666\n"
+    "Taper ratio:  0.27705627705627706\n"
+    "Thickness divided by root chord:  0.017316017316017316\n"
+    "Thickness divided by tip chord:  0.0625\n"
+    "semispan[ft]:  0.4739583333333333\n"
+    "\n\n"
+)
+
+
+def control_surface_report(chord_fraction_tip):
+    """Returns the control surface report printed for the example input, given its tip chord fraction text"""
+    return (
+        "Control Surface Name: rudder\n"
+        "Control Surface Chord Fraction Root:  0.2683982683982684\n"
+        f"Control Surface Chord Fraction Tip:  {chord_fraction_tip}\n"
+        "Control Surface Taper Ratio:  1.0\n"
+        "Control Surface Thickness divided by Root Chord:  0.06451612903225806\n"
+        "Control Surface Thickness divided by Tip Chord:  0.06451612903225806\n"
+        "Control Surface Spanwise Location Root:  0.0\n"
+        "Control Surface Spanwise Location Tip:  1.0\n"
+    )
+
+
+@pytest.fixture
+def write_input(tmp_path):
+    """Returns a function that writes a copy of the example input, with overrides, and returns its path"""
+    def write(name, lifting_surface=None, control_surface=None):
+        with open(EXAMPLE_INPUT, 'r') as json_handle:
+            input_vals = json.load(json_handle)
+        input_vals["lifting_surface"].update(lifting_surface or {})
+        input_vals["control_surface"].update(control_surface or {})
+        path = tmp_path / f"{name}.json"
+        path.write_text(json.dumps(input_vals))
+        return str(path)
+    return write
+
+
+def test_swept_report(write_input, capsys):
+    aircraft_geometry(write_input("swept"))
+    expected = "\nLifting Surface Name: Vertical stabilizer\n" + SWEPT_REPORT + control_surface_report("0.4920634920634921") + "\n"
+    assert capsys.readouterr().out == expected
+
+
+def test_unswept_report(write_input, capsys):
+    aircraft_geometry(write_input("unswept", lifting_surface={"swept[bool]": False, "tip_chord[in]": 2.0}))
+    expected = "\nLifting Surface Name: Vertical stabilizer\n" + UNSWEPT_REPORT + control_surface_report("0.9687500000000001") + "\n"
+    assert capsys.readouterr().out == expected
+
+
+def test_report_without_control_surface(write_input, capsys):
+    aircraft_geometry(write_input("no_control_surface", control_surface={"has_control_surface[bool]": False}))
+    assert capsys.readouterr().out == "\nLifting Surface Name: Vertical stabilizer\n" + SWEPT_REPORT + "\n\n"
+
+
+def test_verbose_false_prints_nothing(write_input, capsys):
+    input_file = write_input("swept")
+    aircraft_geometry(input_file, verbose=False)
+    aircraft_geometry_batch([input_file], verbose=False)
+    assert capsys.readouterr().out == ""
+
+
+def test_extra_control_surface_entries_are_ignored(write_input):
+    input_file = write_input("extra_chord", control_surface={"chord[in]": [1.9375, 1.9375, 5.0]})
+    single = aircraft_geometry(input_file, verbose=False)
+    assert single.control_surface_chords == pytest.approx((1.9375 / 12.0, 1.9375 / 12.0))
+    assert single.control_surface_thickness == pytest.approx((0.125 / 12.0, 0.125 / 12.0))
+    assert single.thickness_control_surface_root == pytest.approx(0.125 / 1.9375)
+
+    batch = aircraft_geometry_batch([input_file, write_input("example")], verbose=False)
+    assert batch.thickness_control_surface_root == pytest.approx([0.125 / 1.9375, 0.125 / 1.9375])
+
+
+def test_batch_matches_single_aircraft(write_input):
+    swept = write_input("swept")
+    unswept = write_input("unswept", lifting_surface={"swept[bool]": False, "tip_chord[in]": 2.0})
+    batch = aircraft_geometry_batch([swept, unswept], verbose=False)
+
+    for index, (input_file, attributes) in enumerate([(swept, COMMON_ATTRIBUTES + SWEPT_ATTRIBUTES),
+                                                      (unswept, COMMON_ATTRIBUTES)]):
+        single = aircraft_geometry(input_file, verbose=False)
+        for attribute in attributes:
+            assert getattr(batch, attribute)[index] == pytest.approx(getattr(single, attribute)), attribute
+
+    assert np.isnan(batch.le_sweep_angle[1])
+    assert np.isnan(batch.quarter_chord_sweep_angle[1])
+
+
+def test_batch_without_control_surface(write_input):
+    input_file = write_input("no_control_surface", control_surface={"has_control_surface[bool]": False})
+    batch = aircraft_geometry_batch([input_file], verbose=False)
+    single = aircraft_geometry(input_file, verbose=False)
+
+    for attribute in ("x_offset_from_nose", "taper_ratio", "thickness_root", "thickness_tip") + SWEPT_ATTRIBUTES:
+        assert getattr(batch, attribute)[0] == pytest.approx(getattr(single, attribute)), attribute
+    for attribute in COMMON_ATTRIBUTES[4:]:
+        assert np.isnan(getattr(batch, attribute)[0]), attribute
+
+
+def test_batch_zero_chord(write_input):
+    input_file = write_input("zero_tip_chord",
+                             lifting_surface={"swept[bool]": False, "tip_chord[in]": 0.0},
+                             control_surface={"has_control_surface[bool]": False})
+    batch = aircraft_geometry_batch([input_file], verbose=False)
+    single = aircraft_geometry(input_file, verbose=False)
+
+    assert single.thickness_tip == "N/A"
+    assert np.isnan(batch.thickness_tip[0])
+    assert batch.taper_ratio[0] == single.taper_ratio == 0.0
+    assert batch.thickness_root[0] == pytest.approx(single.thickness_root)
+
+
+def test_batch_zero_chord_with_control_surface(write_input):
+    input_file = write_input("zero_root_chord", lifting_surface={"root_chord[in]": 0.0})
+    batch = aircraft_geometry_batch([input_file], verbose=False)
+
+    for attribute in ("taper_ratio", "thickness_root", "quarter_chord_sweep_angle",
+                      "control_surface_chord_fraction_root"):
+        assert np.isnan(getattr(batch, attribute)[0]), attribute
+    assert batch.control_surface_chord_fraction_tip[0] == pytest.approx(1.9375 / 3.9375)
+    with pytest.raises(ZeroDivisionError):
+        aircraft_geometry(input_file, verbose=False)
+
+
+def test_batch_requires_input():
+    with pytest.raises(ValueError):
+        aircraft_geometry_batch([], verbose=False)
+
+
+def test_batch_rejects_single_path():
+    with pytest.raises(TypeError):
+        aircraft_geometry_batch(EXAMPLE_INPUT, verbose=False)
+
+
+def test_batch_report(write_input, capsys):
+    aircraft_geometry_batch([write_input("swept")], verbose=True)
+    output = capsys.readouterr().out
+    assert "Batch Geometric Parameters" in output
+    assert "Vertical stabilizer" in output
+    assert f"{math.degrees(math.atan2(3.5, 5.6875)):.8g}" in output
+
+
+@pytest.mark.parametrize("perpendicular_length", [0.0, 3.5])
+def test_zero_parallel_length(write_input, perpendicular_length):
+    input_file = write_input("zero_parallel_length",
+                             lifting_surface={"length_parallel_to_unswept_segment[in]": 0.0,
+                                              "length_perpendicular_to_unswept_segment[in]": perpendicular_length})
+    # the original expression, with the tangent of the leading edge sweep angle taken explicitly
+    root_chord, tip_chord, b = 7.21875 / 12.0, 3.9375 / 12.0, 2 * 5.6875 / 12.0
+    expected = math.atan(math.tan(math.atan2(perpendicular_length / 12.0, 0.0))
+                         + 2*(0.25/b)*root_chord*(tip_chord/root_chord - 1))
+
+    single = aircraft_geometry(input_file, verbose=False)
+    batch = aircraft_geometry_batch([input_file], verbose=False)
+    assert single.quarter_chord_sweep_angle == pytest.approx(expected)
+    assert batch.quarter_chord_sweep_angle[0] == pytest.approx(expected)
+    if perpendicular_length == 0.0:
+        assert math.degrees(single.quarter_chord_sweep_angle) == pytest.approx(-8.207, abs=1e-3)
+    else:
+        assert single.quarter_chord_sweep_angle == pytest.approx(math.pi / 2)
+
+
+def test_cache_invalidated_by_mtime(write_input):
+    input_file = write_input("cached")
+    assert aircraft_geometry(input_file, verbose=False).root_chord == pytest.approx(7.21875 / 12.0)
+    hits = _parse_input.cache_info().hits
+    aircraft_geometry(input_file, verbose=False)
+    assert _parse_input.cache_info().hits == hits + 1
+
+    mtime = os.path.getmtime(input_file)
+    write_input("cached", lifting_surface={"root_chord[in]": 9.0})
+    os.utime(input_file, (mtime + 10, mtime + 10))
+    assert aircraft_geometry(input_file, verbose=False).root_chord == pytest.approx(9.0 / 12.0)
+
+
+def test_cached_control_surface_pairs_are_immutable(write_input):
+    input_file = write_input("shared")
+    first = aircraft_geometry(input_file, verbose=False)
+    with pytest.raises(TypeError):
+        first.control_surface_chords[0] = 1.0
+    second = aircraft_geometry(input_file, verbose=False)
+    assert second.control_surface_chords == pytest.approx((1.9375 / 12.0, 1.9375 / 12.0))